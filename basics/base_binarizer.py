@@ -201,18 +201,18 @@ class BaseBinarizer:
         phoneme_map = {}
         for ph in ph_required:
             phoneme_map[ph] = 0
-        ph_occurred = []
+        ph_occurred = set()
 
         # Load and count those phones that appear in the actual data
         for item_name in self.items:
-            ph_occurred += self.items[item_name]['ph_seq']
+            ph_seq = self.items[item_name]['ph_seq']
+            ph_occurred.update(ph_seq)
             if len(ph_occurred) == 0:
                 raise BinarizationError(f'Empty tokens in {item_name}.')
-        for ph in ph_occurred:
-            if ph not in ph_required:
-                continue
-            phoneme_map[ph] += 1
-        ph_occurred = set(ph_occurred)
+            for ph in ph_seq:
+                if ph not in ph_required:
+                    continue
+                phoneme_map[ph] += 1
 
         print('===== Phoneme Distribution Summary =====')
         for i, key in enumerate(sorted(phoneme_map.keys())):
@@ -2,6 +2,7 @@ import csv
 import json
 import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import librosa
 import numpy as np
@@ -58,6 +59,70 @@ class VarianceBinarizer(BaseBinarizer):
         self.lr = LengthRegulator().to(self.device)
         self.prefer_ds = self.binarization_args['prefer_ds']
         self.cached_ds = {}
+        self.ds_file_names = {}
+
+    def list_ds_files(self, ds_id):
+        # List the DS directory once per dataset so that most lookups do not hit the file system per item
+        if ds_id not in self.ds_file_names:
+            ds_dir = self.raw_data_dirs[ds_id] / 'ds'
+            if ds_dir.is_dir():
+                with os.scandir(ds_dir) as it:
+                    self.ds_file_names[ds_id] = {entry.name for entry in it if entry.is_file()}
+            else:
+                self.ds_file_names[ds_id] = set()
+        return self.ds_file_names[ds_id]
+
+    def has_ds_file(self, ds_id, ds_fn):
+        ds_files = self.list_ds_files(ds_id)
+        if ds_fn in ds_files:
+            return True
+        # Exact name matching misses files on case-insensitive file systems, so ask the file system on a miss
+        if (self.raw_data_dirs[ds_id] / 'ds' / ds_fn).exists():
+            ds_files.add(ds_fn)
+            return True
+        return False
+
+    def locate_ds(self, ds_id, name, idx=0):
+        item_name = f'{ds_id}:{name}'
+        ds_fn = f'{name}{DS_INDEX_SEP}{idx}.ds'
+        if self.has_ds_file(ds_id, ds_fn):
+            cache_key = f'{item_name}{DS_INDEX_SEP}{idx}'
+        else:
+            ds_fn = f'{name}.ds'
+            cache_key = item_name
+            if not self.has_ds_file(ds_id, ds_fn):
+                return None
+        return cache_key, self.raw_data_dirs[ds_id] / 'ds' / ds_fn
+
+    @staticmethod
+    def read_ds(ds_path):
+        with open(ds_path, 'r', encoding='utf8') as f:
+            ds = json.load(f)
+        if not isinstance(ds, list):
+            ds = [ds]
+        return ds
+
+    @staticmethod
+    def get_item_idx(item_name):
+        _, sep, idx = item_name.rpartition(DS_INDEX_SEP)
+        return int(idx) if sep else 0
+
+    def prefetch_ds(self, ds_id, item_names):
+        # Reading DS files is I/O bound and each file is independent, so overlap the reads in threads
+        pending = {}
+        for item_name in item_names:
+            located = self.locate_ds(ds_id, item_name, self.get_item_idx(item_name))
+            if located is None:
+                continue
+            cache_key, ds_path = located
+            if cache_key not in self.cached_ds:
+                pending[cache_key] = ds_path
+        if len(pending) == 0:
+            return
+        with ThreadPoolExecutor() as executor:
+            futures = {executor.submit(self.read_ds, ds_path): cache_key for cache_key, ds_path in pending.items()}
+            for future in as_completed(futures):
+                self.cached_ds[futures[future]] = future.result()
 
     def load_attr_from_ds(self, ds_id, name, attr, idx=0):
         item_name = f'{ds_id}:{name}'
@@ -67,18 +132,11 @@ class VarianceBinarizer(BaseBinarizer):
         elif item_name in self.cached_ds:
             ds = self.cached_ds[item_name][idx]
         else:
-            ds_path = self.raw_data_dirs[ds_id] / 'ds' / f'{name}{DS_INDEX_SEP}{idx}.ds'
-            if ds_path.exists():
-                cache_key = item_name_with_idx
-            else:
-                ds_path = self.raw_data_dirs[ds_id] / 'ds' / f'{name}.ds'
-                cache_key = item_name
-            if not ds_path.exists():
+            located = self.locate_ds(ds_id, name, idx)
+            if located is None:
                 return None
-            with open(ds_path, 'r', encoding='utf8') as f:
-                ds = json.load(f)
-            if not isinstance(ds, list):
-                ds = [ds]
+            cache_key, ds_path = located
+            ds = self.read_ds(ds_path)
             self.cached_ds[cache_key] = ds
             ds = ds[idx]
         return ds.get(attr)
@@ -86,12 +144,15 @@ class VarianceBinarizer(BaseBinarizer):
     def load_meta_data(self, raw_data_dir: pathlib.Path, ds_id, spk_id):
         meta_data_dict = {}
 
-        for utterance_label in csv.DictReader(
-                open(raw_data_dir / 'transcriptions.csv', 'r', encoding='utf8')
-        ):
+        with open(raw_data_dir / 'transcriptions.csv', 'r', encoding='utf8') as f:
+            utterance_labels = list(csv.DictReader(f))
+        if self.prefer_ds:
+            self.prefetch_ds(ds_id, [utterance_label['name'] for utterance_label in utterance_labels])
+
+        for utterance_label in utterance_labels:
             utterance_label: dict
             item_name = utterance_label['name']
-            item_idx = int(item_name.rsplit(DS_INDEX_SEP, maxsplit=1)[-1]) if DS_INDEX_SEP in item_name else 0
+            item_idx = self.get_item_idx(item_name)
 
             def require(attr):
                 if self.prefer_ds:
@@ -28,14 +28,25 @@ F0_TIMESTEP = 0.005
 
 # load dictionaries
 with open(DICTIONARY_FILE, "r", encoding="utf8") as f:
-    _dictionary = f.readlines()
-    _dictionary = [line.strip().split() for line in _dictionary]
-    _dictionary = {line[0]: line[1:] for line in _dictionary}
+    _dictionary = {}
+    for line in f.read().splitlines():
+        parts = line.split()
+        if parts:
+            _dictionary[parts[0]] = parts[1:]
 
 with open(PHONEME_FILE, "r", encoding="utf8") as f:
-    _phoneme = f.readlines()
-    _phoneme = [line.strip().split() for line in _phoneme]
-    _phoneme = {line[0]: float(line[1]) for line in _phoneme}
+    _phoneme = {}
+    for line in f.read().splitlines():
+        parts = line.split()
+        if parts:
+            _phoneme[parts[0]] = float(parts[1])
+
+# lookup tables for the 128 MIDI notes
+_MIDI_HZ = tuple(float(librosa.midi_to_hz(n)) for n in range(128))
+_MIDI_NOTE_NAME = tuple(librosa.midi_to_note(n) for n in range(128))
+
+# cache of lower-cased phonemes and their duration weights, keyed by syllable
+_syllable_cache = {}
 
 
 def _update_midi_info(midi_info: dict[int, dict[str]],
@@ -52,9 +63,7 @@ def _update_midi_info(midi_info: dict[int, dict[str]],
             syllable: the syllable of the current note.
             note: the MIDI note of the current note, or 0 to turn off the current note.
     """
-    if current_time not in midi_info:
-        midi_info[current_time] = {}
-    info = midi_info[current_time]
+    info = midi_info.setdefault(current_time, {})
     info["tempo"] = tempo
     if syllable is not None:
         info["syllable"] = syllable
@@ -74,6 +83,27 @@ def _update_duration(midi_info: list[(int, dict[str])]) -> None:
     midi_info[-1][1]["duration"] = 0
 
 
+def _get_syllable_phonemes(syllable: str) -> [(str, float, float)]:
+    """ Get the phonemes of a syllable together with their duration weights.
+
+        Args:
+            syllable: the syllable to be looked up.
+
+        Returns:
+            A list of (phoneme, weight, total weight) tuples.
+    """
+    if syllable not in _syllable_cache:
+        phoneme = [p.lower() for p in _dictionary[syllable]]
+        if len(phoneme) == 1:
+            _syllable_cache[syllable] = [(phoneme[0], 1, 1)]
+        else:
+            dur0 = _phoneme[phoneme[0]]
+            dur1 = _phoneme[phoneme[1]]
+            _syllable_cache[syllable] = [(phoneme[0], dur0, dur0 + dur1),
+                                         (phoneme[1], dur1, dur0 + dur1)]
+    return _syllable_cache[syllable]
+
+
 def _update_phoneme(midi_info: list[(int, dict[str])]) -> None:
     """ Update the phoneme of each note in the MIDI information list.
 
@@ -82,16 +112,9 @@ def _update_phoneme(midi_info: list[(int, dict[str])]) -> None:
     """
     for mi in midi_info:
         if "syllable" in mi[1] and mi[1]["syllable"] != "" and mi[1]["note"] != 0:
-            phoneme = _dictionary[mi[1]["syllable"]]
-            phoneme = [p.lower() for p in phoneme]
-
-            if len(phoneme) == 1:
-                mi[1]["phoneme"] = [(phoneme[0], mi[1]["duration"])]
-            else:
-                dur0 = _phoneme[phoneme[0]]
-                dur1 = _phoneme[phoneme[1]]
-                mi[1]["phoneme"] = [(phoneme[0], dur0 * mi[1]["duration"] / (dur0 + dur1)),
-                                    (phoneme[1], dur1 * mi[1]["duration"] / (dur0 + dur1))]
+            duration = mi[1]["duration"]
+            mi[1]["phoneme"] = [(p, weight * duration / total)
+                                for p, weight, total in _get_syllable_phonemes(mi[1]["syllable"])]
 
 
 def _align_midi_info(midi_info: list[(int, dict[str])],
@@ -109,68 +132,93 @@ def _align_midi_info(midi_info: list[(int, dict[str])],
         Returns:
             The aligned MIDI information list.
     """
-    syl = [s.split() for s in syllables]
-    lyc = [[c for c in l] for l in lyrics]
-
+    # Build the aligned list in a single forward pass: skipped entries are simply not
+    # appended, and aligned[-1] always refers to the previously aligned entry.
+    aligned = []
     idx = 0
 
-    for i in range(len(syl)):
-        for j in range(len(syl[i])):
-            current_syllable_word = syl[i][j]
-            current_lyric_word = lyc[i][j]
-
-            while idx < len(midi_info) and (("syllable" not in midi_info[idx][1]) or
-                    midi_info[idx][1]["syllable"] != current_syllable_word):
-                if "syllable" in midi_info[idx][1]:
-                    if midi_info[idx][1]["syllable"] == "la":
-                        midi_info.remove(midi_info[idx])
-                        continue
-                    else:
-                        print(f"WARNING:  Lyric and syllable is not matched: {current_lyric_word} vs. {midi_info[idx][1]['syllable']}")
-                        break
-                midi_info[idx][1].pop("syllable", None)
-                midi_info[idx][1].pop("phoneme", None)
-
-                if midi_info[idx][1]["note"] == 0:
-                    midi_info[idx][1]["lyric"] = "<SP>"
-                    midi_info[idx][1]["syllable"] = "<SP>"
-                idx += 1
-
-            if j == 0 and idx > 0 and midi_info[idx - 1][1]["note"] == 0:
-                midi_info[idx - 1][1]["lyric"] = "<SP>"
-                ts = midi_info[idx - 1][0]
-                duration = midi_info[idx - 1][1]["duration"]
-                tempo = midi_info[idx - 1][1]["tempo"]
+    # Positions of the entries carrying a syllable; everything in between is a plain note or rest.
+    syllable_positions = [k for k, mi in enumerate(midi_info) if "syllable" in mi[1]]
+    sp = 0
+
+    for i, sentence in enumerate(syllables):
+        for j, current_syllable_word in enumerate(sentence.split()):
+            # a lyric sentence is indexed character by character
+            current_lyric_word = lyrics[i][j]
+
+            while idx < len(midi_info):
+                next_syllable_idx = syllable_positions[sp] if sp < len(syllable_positions) else len(midi_info)
+                for mi in midi_info[idx:next_syllable_idx]:
+                    mi[1].pop("phoneme", None)
+
+                    if mi[1]["note"] == 0:
+                        mi[1]["lyric"] = "<SP>"
+                        mi[1]["syllable"] = "<SP>"
+                    aligned.append(mi)
+                idx = next_syllable_idx
+
+                if idx >= len(midi_info) or midi_info[idx][1]["syllable"] == current_syllable_word:
+                    break
+                if midi_info[idx][1]["syllable"] == "la":
+                    idx += 1
+                    sp += 1
+                    continue
+                print(f"WARNING:  Lyric and syllable is not matched: {current_lyric_word} vs. {midi_info[idx][1]['syllable']}")
+                break
+
+            if j == 0 and len(aligned) > 0 and aligned[-1][1]["note"] == 0:
+                aligned[-1][1]["lyric"] = "<SP>"
+                ts = aligned[-1][0]
+                duration = aligned[-1][1]["duration"]
+                tempo = aligned[-1][1]["tempo"]
                 ap_duration = AP_TIME_IN_MS * ticks_per_beat * 1000 // tempo
                 if ap_duration < duration:
-                    midi_info[idx - 1][1]["duration"] = duration - ap_duration
+                    aligned[-1][1]["duration"] = duration - ap_duration
                     ts += ap_duration
-                    midi_info.insert(idx,
-                                     (ts, {"note": 0, "duration": ap_duration, "tempo": tempo,
-                                           "lyric": "<AP>", "syllable": "<AP>"}))
-                    idx += 1
+                    aligned.append((ts, {"note": 0, "duration": ap_duration, "tempo": tempo,
+                                         "lyric": "<AP>", "syllable": "<AP>"}))
 
             if idx >= len(midi_info):
                 raise Exception(f"Cannot find syllable {current_syllable_word} in MIDI information list.")
 
             midi_info[idx][1]["lyric"] = current_lyric_word
+            aligned.append(midi_info[idx])
             idx += 1
+            sp += 1
+
+    aligned.extend(midi_info[idx:])
+    midi_info[:] = aligned
 
 
-def _make_f0_seq(note: int, duration: int, tempo: int, ticks_per_beat: int) -> str:
+def _make_f0_seq(note: int, duration: float) -> [str]:
     """Make the F0 sequence from note and duration.
 
         Args:
             note: the MIDI note.
-            duration: the duration of the note.
-            tempo: the tempo of the note.
-            ticks_per_beat: number of ticks per beat in the MIDI file.
+            duration: the duration of the note in seconds.
+
+        Returns:
+            The F0 sequence as a list of formatted values.
     """
 
-    f0 = librosa.midi_to_hz(note) if note != 0 else 0
-    repeats = int(duration * tempo / 1000000.0 / ticks_per_beat / F0_TIMESTEP)
-    f0_seq = " ".join([f"{f0:.3f}"] * repeats)
-    return f0_seq
+    f0 = _MIDI_HZ[note] if note != 0 else 0.0
+    repeats = int(duration / F0_TIMESTEP)
+    return [f"{f0:.3f}"] * repeats
+
+
+def _finalize_ds_item(item: dict[str]) -> dict[str]:
+    """Join the accumulated sequence fields of a DiffSinger item into strings.
+
+        Args:
+            item: the DiffSinger item whose sequence fields are lists.
+
+        Returns:
+            The same item with every list field joined by spaces.
+    """
+    for key, value in item.items():
+        if isinstance(value, list):
+            item[key] = " ".join(value)
+    return item
 
 
 def _make_ds(midi_info: list[(int, dict[str])],
@@ -190,47 +238,45 @@ def _make_ds(midi_info: list[(int, dict[str])],
         ts = mi[0]
         if "lyric" not in mi[1]:
             continue
+        tempo = mi[1]["tempo"]
+        # evaluate left to right as before: factoring out tempo / ticks_per_beat changes the rounding
+        dur_sec = mi[1]["duration"] * tempo / 1000000.0 / ticks_per_beat
         if mi[1]["lyric"] == "<AP>":
             if current_dict != {}:
-                ds.append(current_dict)
+                ds.append(_finalize_ds_item(current_dict))
                 current_dict = OrderedDict()
-            current_dict["offset"] = ts * mi[1]["tempo"] / 1000000.0 / ticks_per_beat
-            current_dict["text"] = "AP"
-            current_dict["ph_seq"] = "AP"
-            current_dict["ph_dur"] = "{:.3f}".format(mi[1]["duration"] * mi[1]["tempo"] / 1000000.0 / ticks_per_beat)
-            current_dict["ph_num"] = "1"
-            current_dict["note_seq"] = "REST"
-            current_dict["note_dur"] = "{:.3f}".format(mi[1]["duration"] * mi[1]["tempo"] / 1000000.0 / ticks_per_beat)
-            current_dict["note_slur"] = "0"
-            current_dict["f0_seq"] = _make_f0_seq(0, mi[1]["duration"], mi[1]["tempo"], ticks_per_beat)
+            current_dict["offset"] = ts * tempo / 1000000.0 / ticks_per_beat
+            current_dict["text"] = ["AP"]
+            current_dict["ph_seq"] = ["AP"]
+            current_dict["ph_dur"] = ["{:.3f}".format(dur_sec)]
+            current_dict["ph_num"] = ["1"]
+            current_dict["note_seq"] = ["REST"]
+            current_dict["note_dur"] = ["{:.3f}".format(dur_sec)]
+            current_dict["note_slur"] = ["0"]
+            current_dict["f0_seq"] = _make_f0_seq(0, dur_sec)
             current_dict["f0_timestep"] = "{:.3f}".format(F0_TIMESTEP)
         else:
             if current_dict == {}:
                 continue
             lyric = mi[1]["lyric"] if mi[1]["lyric"] != "<SP>" else "SP"
-            current_dict["text"] += (" " + lyric)
+            current_dict["text"].append(lyric)
             num_ph = len(mi[1]["phoneme"]) if mi[1]["lyric"] != "<SP>" else 1
-            current_dict["ph_num"] += (" " + str(num_ph))
-            current_dict["note_dur"] += " {:.3f}".format(
-                mi[1]["duration"] * mi[1]["tempo"] / 1000000.0 / ticks_per_beat
-            )
-            current_dict["note_slur"] += " 0"
-            current_dict["f0_seq"] = _make_f0_seq(
-                0, mi[1]["duration"], mi[1]["tempo"], ticks_per_beat
-            )
+            current_dict["ph_num"].append(str(num_ph))
+            current_dict["note_dur"].append("{:.3f}".format(dur_sec))
+            current_dict["note_slur"].append("0")
+            current_dict["f0_seq"] = _make_f0_seq(0, dur_sec)
             current_dict["f0_timestep"] = "{:.3f}".format(F0_TIMESTEP)
             if mi[1]["lyric"] != "<SP>":
-                current_dict["ph_seq"] += (" " + " ".join([p[0] for p in mi[1]["phoneme"]]))
-                current_dict["ph_dur"] += (" " + " ".join(["{:.3f}".format(p[1] * mi[1]["tempo"] / 1000000.0 /
-                                                           ticks_per_beat) for p in mi[1]["phoneme"]]))
-                current_dict["note_seq"] += (" " + librosa.midi_to_note(mi[1]["note"]))
+                current_dict["ph_seq"].extend([p[0] for p in mi[1]["phoneme"]])
+                current_dict["ph_dur"].extend(["{:.3f}".format(p[1] * tempo / 1000000.0 / ticks_per_beat)
+                                               for p in mi[1]["phoneme"]])
+                current_dict["note_seq"].append(_MIDI_NOTE_NAME[mi[1]["note"]])
             else:
-                current_dict["ph_seq"] += " SP"
-                current_dict["ph_dur"] += " {:.3f}".format(mi[1]["duration"] * mi[1]["tempo"]
-                                                           / 1000000.0 / ticks_per_beat)
-                current_dict["note_seq"] += " REST"
+                current_dict["ph_seq"].append("SP")
+                current_dict["ph_dur"].append("{:.3f}".format(dur_sec))
+                current_dict["note_seq"].append("REST")
     if current_dict != {}:
-        ds.append(current_dict)
+        ds.append(_finalize_ds_item(current_dict))
 
     return ds
 
@@ -238,7 +284,8 @@ def _make_ds(midi_info: list[(int, dict[str])],
 def midi2ds(midi_file: str,
             lyrics: [str],
             syllables: [str],
-            output_file: str) -> None:
+            output_file: str,
+            verbose: bool = False) -> None:
     """ Convert an annotated MIDI file to a DiffSinger file.
 
         The MIDI file must be annotated with the following metadata:
@@ -248,6 +295,7 @@ def midi2ds(midi_file: str,
         lyrics: lyrics of the song, sentence by sentence.
         syllables: syllables of the song, sentence by sentence.
         output_file: the output DiffSinger file.
+        verbose: whether to print every MIDI message and the aligned MIDI information.
     """
 
     tempo = DEFAULT_TEMPO
@@ -260,8 +308,9 @@ def midi2ds(midi_file: str,
     for tid, track in enumerate(midi.tracks):
         print(f"Track {tid}: {track.name} ({len(track)} messages)")
         current_time = 0
-        for i, msg in enumerate(track):
-            # print(msg)
+        for msg in track:
+            if verbose:
+                print(msg)
             if msg.type == "end_of_track":
                 break
             elif msg.type == "set_tempo":
@@ -289,12 +338,12 @@ def midi2ds(midi_file: str,
     # Align the midi info with lyrics and syllables
     _align_midi_info(midi_info, ticks_per_beat, lyrics, syllables)
 
-    print(midi_info)
+    if verbose:
+        print(midi_info)
 
     # Make the DiffSinger file from midi info list
     ds = _make_ds(midi_info, ticks_per_beat)
 
     # Write the DiffSinger file
-    ds_json_obj = json.dumps(ds, indent=2, ensure_ascii=False).encode("utf8")
     with open(output_file, "w", encoding="utf8") as f:
-        f.write(ds_json_obj.decode())
+        json.dump(ds, f, indent=2, ensure_ascii=False)
@@ -27,6 +27,9 @@ SOURCE_DIR = root_dir.joinpath("samples", "12-songs")
 SOURCE_LYRIC_FILE = SOURCE_DIR.joinpath("lyrics.txt")
 DEST_DIR = root_dir.joinpath("samples", "12-songs-ds")
 
+# translation table that deletes all punctuations
+_PUNCT_TABLE = str.maketrans("", "", punctuation)
+
 
 def _load_lyrics(lyric_file: Path) -> list[list[str]]:
     """ Load the lyric file.
@@ -39,11 +42,8 @@ def _load_lyrics(lyric_file: Path) -> list[list[str]]:
     """
     lyrics = []
     with open(lyric_file, "r", encoding="utf8") as f:
-        lines = f.readlines()
-
-        # remove punctuations
-        for i in punctuation:
-            lines = [line.replace(i, "") for line in lines]
+        # remove punctuations from the whole text at once
+        lines = f.read().translate(_PUNCT_TABLE).splitlines()
 
         lines = [line.strip() for line in lines]
 
@@ -74,10 +74,7 @@ def _pinyin_to_syllable(py: str) -> str:
         Returns:
             The syllable.
     """
-    while len(py) > 0 and py[-1].isdigit():
-        py = py[:-1]
-
-    return py
+    return py.rstrip("0123456789")
 
 
 def _lyrics_to_syllables(lyrics: list[list[str]]) -> list[list[str]]: